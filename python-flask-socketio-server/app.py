@@ -4,35 +4,56 @@
 
 # to run:
 #     python3 app.py
+# or, under gunicorn (one worker only; socket.io state lives in this process):
+#     gunicorn -k eventlet -w 1 -b HOST:PORT app:app
 
-import base64
+# eventlet must patch the standard library before anything else is imported
+import eventlet
+
+eventlet.monkey_patch()
+
+import functools
+import logging
 from pathlib import Path
 import os
+import queue
+import socket
 import ssl
+import threading
 
+import orjson
 import paho.mqtt.client as mqtt
 from flask import Flask, render_template, send_from_directory
 from flask_socketio import SocketIO
-from yaml import safe_load
+import yaml
+
+# prefer libyaml-backed C loader; fall back to pure-python loader if unavailable
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# set LOGLEVEL=INFO (or DEBUG) in the environment for more output
+logging.basicConfig(level=os.environ.get("LOGLEVEL", "WARNING").upper())
+log = logging.getLogger(__name__)
 
 # determine path to this script
 mypath = Path().absolute()
 
 # Load a default image file
 default_image_file = mypath / "static" / "img" / "default.png"
-print("Using default cover image file {}".format(default_image_file))
+log.info("Using default cover image file %s", default_image_file)
 default_image_mime_type = "image/png"
-default_image_b64_str = ""
-with default_image_file.open("rb") as imageFile:
-    image_octets = imageFile.read()
-    default_image_b64_str = base64.b64encode(image_octets).decode("utf-8")
+default_image_octets = default_image_file.read_bytes()
+# cover art message sent whenever an empty cover is published; built once
+default_cover_msg = {"data": default_image_octets, "mimetype": default_image_mime_type}
 
 # App will die here if config file is missing.
 # Read only on startup. If edited, app must be relaunched to see changes
 config_file = mypath / "config.yaml"
-print("Using config file {}".format(config_file))
+log.info("Using config file %s", config_file)
 with config_file.open() as f:
-    config = safe_load(f)
+    config = yaml.load(f, Loader=SafeLoader)
 
 # subtrees of the config file
 MQTT_CONF = config["mqtt"]  # required section
@@ -41,14 +62,31 @@ WEBUI_CONF = config.get("webui", {})  # if missing, assume defaults
 
 # "base" topic - should match shairport-sync.conf {mqtt.topic}
 TOPIC_ROOT = MQTT_CONF["topic"]
-print(TOPIC_ROOT)
+log.info("MQTT topic root %s", TOPIC_ROOT)
 
 # this variable will keep the most recent track info pieces sent to socketio
 SAVED_INFO = {}
 
+
+class OrjsonAdapter:
+    """Minimal json-module stand-in backed by orjson, for socket.io packets.
+
+    python-socketio/engineio call dumps() with stdlib json keyword arguments
+    (e.g. separators); orjson always emits compact output, so they are ignored.
+    """
+
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        return orjson.dumps(obj).decode("utf-8")
+
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
 app.config["SECRET_KEY"] = WEBSERVER_CONF.get("secret_key", "secret!")
-socketio = SocketIO(app)
+socketio = SocketIO(app, async_mode="eventlet", json=OrjsonAdapter)
 
 known_play_metadata_types = {
     "songalbum": "songalbum",
@@ -73,83 +111,94 @@ known_core_metadata_types = {
 }
 
 
-def populateTemplateData(config):
-    """Use values from config file to form templateData for HTML template.
-
-    Set default value if the key is not found in config (second arg in dict.get())
-    """
-    templateData = {}
-
-    if config.get("show_player", True):
-        templateData["showPlayer"] = True
-
-        if config.get("show_player_extended", False):
-            templateData["showPlayerExtended"] = True
-
-        if config.get("show_player_shuffle", False):
-            templateData["showPlayerShuffle"] = True
+# (config key, default value, template key) for each simple on/off UI flag
+_TPL_FLAGS = (
+    ("show_player", True, "showPlayer"),
+    ("show_canvas", False, "showCanvas"),
+    ("show_update_info", True, "showUpdateInfo"),
+    ("show_artwork", True, "showCoverArt"),
+    ("artwork_rounded_corners", False, "showCoverArtRoundedCorners"),
+)
 
-        if config.get("show_player_seeking", False):
-            templateData["showPlayerSeeking"] = True
+# flags that only apply when the player is shown
+_TPL_PLAYER_FLAGS = (
+    ("show_player_extended", False, "showPlayerExtended"),
+    ("show_player_shuffle", False, "showPlayerShuffle"),
+    ("show_player_seeking", False, "showPlayerSeeking"),
+    ("show_player_stop", False, "showPlayerStop"),
+)
 
-        if config.get("show_player_stop", False):
-            templateData["showPlayerStop"] = True
 
-    if config.get("show_canvas", False):
-        templateData["showCanvas"] = True
-
-    if config.get("show_update_info", True):
-        templateData["showUpdateInfo"] = True
-
-    if config.get("show_artwork", True):
-        templateData["showCoverArt"] = True
+def populateTemplateData(config):
+    """Use values from config file to form templateData for HTML template.
 
-    if config.get("artwork_rounded_corners", False):
-        templateData["showCoverArtRoundedCorners"] = True
+    Set default value if the key is not found in config (default in flag tables)
+    """
+    templateData = {
+        tpl_key: True
+        for config_key, default, tpl_key in _TPL_FLAGS
+        if config.get(config_key, default)
+    }
+
+    if templateData.get("showPlayer"):
+        templateData.update(
+            {
+                tpl_key: True
+                for config_key, default, tpl_key in _TPL_PLAYER_FLAGS
+                if config.get(config_key, default)
+            }
+        )
 
     if config.get("show_track_metadata", True):
         metadata_types = config.get(
-            "track_metadata", ["artist", "album", "title"]
+            "track_metadata", ("artist", "album", "title")
         )  # defaults to these three
-        for metadata_type in metadata_types:
-            if metadata_type in known_core_metadata_types:
-                templateData[known_core_metadata_types[metadata_type]] = True
+        templateData.update(
+            {
+                known_core_metadata_types[metadata_type]: True
+                for metadata_type in metadata_types
+                if metadata_type in known_core_metadata_types
+            }
+        )
 
     return templateData
 
 
-def _form_subtopic_topic(subtopic):
-    """Return full topic path given subtopic."""
-    topic = TOPIC_ROOT + "/" + subtopic
-    return topic
+# Full MQTT topic paths, formed once at startup
+TOPICS = {
+    subtopic: f"{TOPIC_ROOT}/{subtopic}"
+    for subtopic in (*known_core_metadata_types, *known_play_metadata_types, "cover")
+}
+TOPIC_COVER = TOPICS["cover"]
+# MQTT topic that shairport-sync listens on for remote commands
+TOPIC_REMOTE = f"{TOPIC_ROOT}/remote"
 
 
 # Available commands listed in shairport-sync.conf
-known_remote_commands = [
-    "command",
-    "beginff",
-    "beginrew",
-    "mutetoggle",
-    "nextitem",
-    "previtem",
-    "pause",
-    "playpause",
-    "play",
-    "stop",
-    "playresume",
-    "shuffle_songs",
-    "volumedown",
-    "volumeup",
-]
+known_remote_commands = frozenset(
+    {
+        "command",
+        "beginff",
+        "beginrew",
+        "mutetoggle",
+        "nextitem",
+        "previtem",
+        "pause",
+        "playpause",
+        "play",
+        "stop",
+        "playresume",
+        "shuffle_songs",
+        "volumedown",
+        "volumeup",
+    }
+)
 
 
 def _generate_remote_command(command):
     """Return MQTT topic and message for a given remote command."""
     if command in known_remote_commands:
-        print(command)
-        topic = TOPIC_ROOT + "/remote"
-        msg = command
-        return topic, msg
+        return TOPIC_REMOTE, command
     else:
         raise ValueError("Unknown remote command: {}".format(command))
 
@@ -162,32 +211,59 @@ def on_connect(client, userdata, flags, rc):
     """
     # print("Connected with result code {}".format(rc))
 
-    subtopic_list = list(known_core_metadata_types.keys())
-    subtopic_list.extend(list(known_play_metadata_types.keys()))
+    # one SUBSCRIBE packet for all topics
+    (result, msg_id) = client.subscribe(SUBSCRIPTIONS)
+    log.debug("subscribed %s %s", SUBSCRIPTIONS, msg_id)
+
+
+def on_socket_open(client, userdata, sock):
+    """For when MQTT client has opened its socket to the server.
+
+    Disables Nagle's algorithm, so small publishes (remote commands) are sent
+    immediately rather than being coalesced.
+    """
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
-    # if we are not showing cover art, do not subscribe to it
-    if (populateTemplateData(WEBUI_CONF)).get("showCoverArt"):
-        subtopic_list.append("cover")
 
-    for subtopic in subtopic_list:
-        topic = _form_subtopic_topic(subtopic)
-        print("topic", topic, end=" ")
-        (result, msg_id) = client.subscribe(topic, 0)  # QoS==0 should be fine
-        print(msg_id)
+# leading bytes ("magic numbers") of supported image formats
+JPEG_MAGIC = b"\xff\xd8"
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
 
 
 def _guessImageMime(magic):
     """Peeks at leading bytes in binary object to identify image format."""
-    if magic.startswith(b"\xff\xd8"):
+    head = magic[:8]
+    if head[:2] == JPEG_MAGIC:
         return "image/jpeg"
-    elif magic.startswith(b"\x89PNG\r\n\x1a\r"):
+    elif head == PNG_MAGIC:
         return "image/png"
     else:
-        return "image/jpg"
+        return "application/octet-stream"
+
+
+# Playing metadata messages waiting to be sent to browser clients. A new track
+# publishes several fields within milliseconds; they are coalesced into a single
+# "playing_batch" event sent PLAYING_BATCH_DELAY seconds after the first one.
+PLAYING_BATCH_DELAY = 0.05
+_pending_playing = {}
+_pending_playing_lock = threading.Lock()
+_playing_flush_scheduled = False
+
+
+def _flush_playing_batch(delay):
+    """Background task: after delay, send pending playing metadata as one event."""
+    global _playing_flush_scheduled
+
+    socketio.sleep(delay)
+    with _pending_playing_lock:
+        batch = dict(_pending_playing)
+        _pending_playing.clear()
+        _playing_flush_scheduled = False
+    socketio.emit("playing_batch", batch)
 
 
 def _send_and_store_playing_metadata(metadata_name, message):
-    """Forms playing metadata message and sends to browser client using socket.io.
+    """Forms playing metadata message and queues it for browser clients.
 
     Also saves a copy of sent message (into SAVED_INFO dict), which is used to
     resend most-recent event messages in case the browser page is refreshed,
@@ -195,54 +271,53 @@ def _send_and_store_playing_metadata(metadata_name, message):
 
     Applies a naming convention of prepending string 'playing_' to metadata
     name in socketio sent event. Of course the same naming convention is used
-    on receiving client event.
+    on receiving client event. Messages are delivered inside a "playing_batch"
+    event, keyed by that name. A value identical to the saved one is not resent.
     """
+    global _playing_flush_scheduled
+
     # print("{} update".format(metadata_name))
-    msg = {"data": message.payload.decode("utf8")}
+    data = message.payload.decode("utf8")
     emitted_metadata_name = "playing_{}".format(metadata_name)
+    # skip republished values (e.g. retained topics) that clients already have
+    saved_msg = SAVED_INFO.get(emitted_metadata_name)
+    if saved_msg is not None and saved_msg["data"] == data:
+        return
+    msg = {"data": data}
     SAVED_INFO[emitted_metadata_name] = msg
-    socketio.emit(emitted_metadata_name, msg)
+    with _pending_playing_lock:
+        _pending_playing[emitted_metadata_name] = msg
+        if not _playing_flush_scheduled:
+            _playing_flush_scheduled = True
+            socketio.start_background_task(_flush_playing_batch, PLAYING_BATCH_DELAY)
 
 
-def _send_play_event(metadata_name):
-    """Forms play event message and sends to browser client using socket.io."""
-    print("{}".format(metadata_name))
-    socketio.emit(metadata_name, metadata_name)
-
-
-# https://stackoverflow.com/a/1970037
-def make_interpolator(left_min, left_max, right_min, right_max):
-    """Create factory for an interpolator function."""
-    # Figure out how 'wide' each range is
-    leftSpan = left_max - left_min
-    rightSpan = right_max - right_min
+def _send_play_event(metadata_name, message):
+    """Forms play event message and sends to browser client using socket.io.
 
-    # Compute the scale factor between left and right values
-    scaleFactor = float(rightSpan) / float(leftSpan)
-
-    # create interpolation function using pre-calculated scaleFactor
-    def interp_fn(value):
-        return right_min + (value - left_min) * scaleFactor
-
-    return interp_fn
+    The MQTT message is unused; the event itself is the information.
+    """
+    log.debug("%s", metadata_name)
+    socketio.emit(metadata_name, metadata_name)
 
 
 # https://github.com/mikebrady/shairport-sync-metadata-reader/blob/master/README.md
 # sent as a string "airplay_volume,volume,lowest_volume,highest_volume"
 # - airplay_volume is 0.00 down to -30.00, with -144.00 meaning "mute"
-volume_scaler = make_interpolator(-30.0, 0, -0.5, 100.0)
+# airplay_volume range (-30.0, 0) is mapped linearly onto percent range (-0.5, 100.0):
+#   percent = -0.5 + (airplay_volume + 30.0) * (100.5 / 30.0)
+VOLUME_SCALE = 100.5 / 30.0
+VOLUME_OFFSET = 100.0
 
 
 def _send_volume_event(metadata_name, message):
     """Forms volume event message and sends to browser client using socket.io."""
-    print("{}".format(metadata_name))
-    (airplay_volume, volume, lowest_volume, highest_volume) = message.payload.decode(
-        "ascii"
-    ).split(",")
-    volume_as_percent = 0.0
+    log.debug("%s", metadata_name)
+    # only the leading airplay_volume field is used
     try:
-        airplay_volume_float = float(airplay_volume)
-        volume_as_percent = volume_scaler(airplay_volume_float)
+        volume_as_percent = VOLUME_OFFSET + (
+            float(message.payload.split(b",", 1)[0]) * VOLUME_SCALE
+        )
     except ValueError:
         volume_as_percent = 50.0
 
@@ -250,59 +325,109 @@ def _send_volume_event(metadata_name, message):
     socketio.emit(metadata_name, msg)
 
 
-def on_message(client, userdata, message):
-    """Implement callback for when a subscribed-to MQTT message is received."""
-    if message.topic != _form_subtopic_topic("cover"):
-        print(message.topic, message.payload)
+def _send_cover_art(payload):
+    """Forms cover art message and sends to browser client using socket.io.
 
-    # Playing track info fields
-    if message.topic == _form_subtopic_topic("artist"):
-        _send_and_store_playing_metadata("artist", message)
-    if message.topic == _form_subtopic_topic("album"):
-        _send_and_store_playing_metadata("album", message)
-    if message.topic == _form_subtopic_topic("genre"):
-        _send_and_store_playing_metadata("genre", message)
-    if message.topic == _form_subtopic_topic("title"):
-        _send_and_store_playing_metadata("title", message)
+    Image bytes are sent as a binary socket.io attachment (no base64), along
+    with their mimetype so the browser can build a Blob from them. Artwork
+    identical to the saved (most recently sent) one is not resent; shairport-sync
+    often re-sends unchanged artwork.
+    """
+    # print("cover update")
+    image_octets = payload or default_image_octets
+    saved_msg = SAVED_INFO.get("cover_art")
+    if saved_msg is not None and saved_msg["data"] == image_octets:
+        return
+
+    if payload:
+        msg = {"data": payload, "mimetype": _guessImageMime(payload)}
+    else:
+        msg = default_cover_msg
+    SAVED_INFO["cover_art"] = msg
+    socketio.emit("cover_art", msg)
 
-    # Player state
-    if message.topic == _form_subtopic_topic("play_start"):
-        _send_play_event("play_start")
-    if message.topic == _form_subtopic_topic("play_end"):
-        _send_play_event("play_end")
-    if message.topic == _form_subtopic_topic("play_flush"):
-        _send_play_event("play_flush")
-    if message.topic == _form_subtopic_topic("play_resume"):
-        _send_play_event("play_resume")
 
-    # volume
-    if message.topic == _form_subtopic_topic("volume"):
-        _send_volume_event("volume", message)
+# Cover art payloads waiting to be sent. Kept small so that a burst
+# of artwork updates coalesces to the most recent ones.
+cover_q = queue.Queue(maxsize=2)
+
+
+def _queue_cover_art(message):
+    """Hand cover art payload to the background worker, dropping the oldest if full.
+
+    Keeps sending off the MQTT network thread.
+    """
+    try:
+        cover_q.put_nowait(message.payload)
+    except queue.Full:
+        try:
+            cover_q.get_nowait()
+        except queue.Empty:
+            pass
+        cover_q.put_nowait(message.payload)
+
+
+def _cover_art_worker():
+    """Background task: send queued cover art payloads."""
+    while True:
+        payload = cover_q.get()
+        _send_cover_art(payload)
+
 
+# Map each full MQTT topic to its handler, so on_message does a single lookup.
+# Built once at startup; handlers are called with the received MQTT message.
+TOPIC_DISPATCH = {
+    # Playing track info fields
+    **{
+        TOPICS[subtopic]: functools.partial(_send_and_store_playing_metadata, subtopic)
+        for subtopic in ("artist", "album", "genre", "title")
+    },
+    # Player state
+    **{
+        TOPICS[subtopic]: functools.partial(_send_play_event, subtopic)
+        for subtopic in ("play_start", "play_end", "play_flush", "play_resume")
+    },
+    # volume
+    TOPICS["volume"]: functools.partial(_send_volume_event, "volume"),
     # cover art
-    if message.topic == _form_subtopic_topic("cover"):
-        # print("cover update")
-        if message.payload:
-            mime_type = _guessImageMime(message.payload)
-            image_b64_str = base64.b64encode(message.payload).decode("utf-8")
-        else:
-            mime_type = default_image_mime_type
-            image_b64_str = default_image_b64_str
-        msg = {"data": image_b64_str, "mimetype": mime_type}
-        SAVED_INFO["cover_art"] = msg
-        socketio.emit("cover_art", msg)
+    TOPIC_COVER: _queue_cover_art,
+}
+
+
+def on_message(client, userdata, message):
+    """Implement callback for when a subscribed-to MQTT message is received."""
+    handler = TOPIC_DISPATCH.get(message.topic)
+    if handler is not _queue_cover_art:
+        log.debug("%s %s", message.topic, message.payload)
+
+    if handler is not None:
+        handler(message)
+
+
+templateData = populateTemplateData(WEBUI_CONF)
 
+# (topic, QoS) list subscribed to on every (re)connect; QoS==0 should be fine
+subtopic_list = list(known_core_metadata_types)
+subtopic_list.extend(known_play_metadata_types)
+# if we are not showing cover art, do not subscribe to it
+if templateData.get("showCoverArt"):
+    subtopic_list.append("cover")
+SUBSCRIPTIONS = [(TOPICS[subtopic], 0) for subtopic in subtopic_list]
 
 # Configure MQTT broker connection
 mqttc = mqtt.Client()
+# retry quickly after broker blips, backing off to at most 8 seconds
+mqttc.reconnect_delay_set(min_delay=1, max_delay=8)
+mqttc.max_inflight_messages_set(100)
 
 # register callbacks
 mqttc.on_connect = on_connect
+mqttc.on_socket_open = on_socket_open
 mqttc.on_message = on_message
 
 if MQTT_CONF.get("use_tls"):
     tls_conf = MQTT_CONF.get("tls")
-    print("Using TLS config", tls_conf)
+    log.info("Using TLS config %s", tls_conf)
     # assumes full valid TLS configuration for paho lib
     if tls_conf:
         mqttc.tls_set(
@@ -321,7 +446,7 @@ if MQTT_CONF.get("use_tls"):
 
 if MQTT_CONF.get("username"):
     username = MQTT_CONF.get("username")
-    print("MQTT username:", username)
+    log.info("MQTT username: %s", username)
     pw = MQTT_CONF.get("password")
     if pw:
         mqttc.username_pw_set(username, password=pw)
@@ -329,24 +454,33 @@ if MQTT_CONF.get("username"):
         mqttc.username_pw_set(username)
 
 if MQTT_CONF.get("logger"):
-    print("Enabling MQTT logging")
+    log.info("Enabling MQTT logging")
     mqttc.enable_logger()
 
+# start cover art worker before any MQTT messages can arrive
+socketio.start_background_task(_cover_art_worker)
+
 # Launch MQTT broker connection
 mqtt_host = MQTT_CONF["host"]
 mqtt_port = MQTT_CONF["port"]
-print("Connecting to broker", mqtt_host, "port", mqtt_port)
+log.info("Connecting to broker %s port %s", mqtt_host, mqtt_port)
 mqttc.connect(mqtt_host, port=mqtt_port)
 # loop_start run a thread in the background
 mqttc.loop_start()
 
-templateData = populateTemplateData(WEBUI_CONF)
+
+# templateData and async_mode are fixed at startup, so render the page only once.
+# A request context is needed for url_for() in the templates.
+with app.test_request_context("/"):
+    MAIN_PAGE_HTML = render_template(
+        "main.html", async_mode=socketio.async_mode, **templateData
+    )
 
 
 # Define Flask server routes
 @app.route("/")
 def main():
-    return render_template("main.html", async_mode=socketio.async_mode, **templateData)
+    return MAIN_PAGE_HTML
 
 
 @app.route("/favicon.ico")
@@ -356,6 +490,7 @@ def favicon():
         os.path.join(app.root_path, "static"),
         "img/favicon.ico",
         mimetype="image/vnd.microsoft.icon",
+        max_age=31536000,  # one year; favicon never changes
     )
 
 
@@ -369,105 +504,37 @@ def handle_my_custom_event(json):
     """
     # print('received data: ' + str(json))
     if json.get("data"):
-        print("myevent:", json["data"])
+        log.debug("myevent: %s", json["data"])
 
     for key, msg in SAVED_INFO.items():
         # print(key, msg)
-        print(key,)
+        log.debug("%s", key)
         socketio.emit(key, msg)
 
 
-@socketio.on("remote_previtem")
-def handle_previtem(json):
-    print("handle_previtem", str(json))
-    (topic, msg) = _generate_remote_command("previtem")
-    mqttc.publish(topic, msg)
-
-
-@socketio.on("remote_nextitem")
-def handle_nextitem(json):
-    print("handle_nextitem", str(json))
-    (topic, msg) = _generate_remote_command("nextitem")
-    mqttc.publish(topic, msg)
-
-
-# what 'stop' does is not desired; cannot be resumed
-@socketio.on("remote_stop")
-def handle_stop(json):
-    print("handle_stop", str(json))
-    print("WARNING: remote_stop cannot be resumed")
-    (topic, msg) = _generate_remote_command("stop")
-    mqttc.publish(topic, msg)
-
-
-@socketio.on("remote_pause")
-def handle_pause(json):
-    print("handle_pause", str(json))
-    (topic, msg) = _generate_remote_command("pause")
-    mqttc.publish(topic, msg)
-
-
-@socketio.on("remote_playpause")
-def handle_playpause(json):
-    print("handle_playpause", str(json))
-    (topic, msg) = _generate_remote_command("playpause")
-    mqttc.publish(topic, msg)
+def _make_remote_command_handler(command):
+    """Create socketio event handler that publishes a remote command to MQTT."""
+    (topic, msg) = _generate_remote_command(command)
 
+    def handle_remote_command(json):
+        log.debug("handle_%s %s", command, json)
+        # what 'stop' does is not desired; cannot be resumed
+        if command == "stop":
+            log.warning("remote_stop cannot be resumed")
+        mqttc.publish(topic, msg)
 
-@socketio.on("remote_play")
-def handle_play(json):
-    print("handle_play", str(json))
-    (topic, msg) = _generate_remote_command("play")
-    mqttc.publish(topic, msg)
+    return handle_remote_command
 
 
-@socketio.on("remote_playresume")
-def handle_playresume(json):
-    print("handle_playresume", str(json))
-    (topic, msg) = _generate_remote_command("playresume")
-    mqttc.publish(topic, msg)
-
-
-@socketio.on("remote_mutetoggle")
-def handle_mutetoggle(json):
-    print("handle_mutetoggle", str(json))
-    (topic, msg) = _generate_remote_command("mutetoggle")
-    mqttc.publish(topic, msg)
-
-
-@socketio.on("remote_volumedown")
-def handle_volumedown(json):
-    print("handle_volumedown", str(json))
-    (topic, msg) = _generate_remote_command("volumedown")
-    mqttc.publish(topic, msg)
-
-
-@socketio.on("remote_volumeup")
-def handle_volumeup(json):
-    print("handle_volumeup", str(json))
-    (topic, msg) = _generate_remote_command("volumeup")
-    mqttc.publish(topic, msg)
-
-
-@socketio.on("remote_beginrew")
-def handle_beginrew(json):
-    print("handle_beginrew", str(json))
-    (topic, msg) = _generate_remote_command("beginrew")
-    mqttc.publish(topic, msg)
-
-
-@socketio.on("remote_beginff")
-def handle_beginff(json):
-    print("handle_beginff", str(json))
-    (topic, msg) = _generate_remote_command("beginff")
-    mqttc.publish(topic, msg)
+def _register_remote_command_handlers():
+    """Register a "remote_<command>" socketio event for each known remote command."""
+    for command in known_remote_commands:
+        socketio.on_event(
+            "remote_{}".format(command), _make_remote_command_handler(command)
+        )
 
 
-@socketio.on("remote_shuffle_songs")
-def handle_shuffle_songs(json):
-    print("handle_shuffle_songs", str(json))
-    (topic, msg) = _generate_remote_command("shuffle_songs")
-    mqttc.publish(topic, msg)
+_register_remote_command_handlers()
 
 
 # launch the Flask (+socketio) webserver!
@@ -475,6 +542,6 @@ if __name__ == "__main__":
     web_host = WEBSERVER_CONF["host"]
     web_port = WEBSERVER_CONF["port"]
     web_debug = WEBSERVER_CONF["debug"]
-    print("Starting webserver")
-    print("   http://{}:{}".format(web_host, web_port))
+    log.info("Starting webserver")
+    log.info("   http://%s:%s", web_host, web_port)
     socketio.run(app, host=web_host, port=web_port, debug=web_debug)